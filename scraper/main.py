@@ -10,14 +10,16 @@ Usage::
 from __future__ import annotations
 
 import argparse
+import functools
 import logging
 import sys
 import time
-from collections import Counter
+from itertools import chain
 from pathlib import Path
+from typing import Iterable, Iterator
 
 from scraper.fetcher import BooksFetcher, FetchError
-from scraper.parser import Book, BooksParser, ParseError
+from scraper.parser import DEFAULT_WORKERS, Book, BooksParser, ParseError
 from scraper.exporter import export_csv, export_json, ExportError
 
 __all__ = ["build_parser", "print_summary", "main"]
@@ -34,8 +36,13 @@ def setup_logging(level: int = logging.INFO) -> None:
     )
 
 
+@functools.lru_cache(maxsize=1)
 def build_parser() -> argparse.ArgumentParser:
-    """Build and return the CLI argument parser."""
+    """Build and return the CLI argument parser.
+
+    The parser is built once and shared by every call; ``parse_args()``
+    keeps no state on it, but callers must not add arguments to it.
+    """
     parser = argparse.ArgumentParser(
         prog="python -m scraper.main",
         description="Scrape books from books.toscrape.com",
@@ -63,6 +70,19 @@ def build_parser() -> argparse.ArgumentParser:
         "--output-dir", type=str, default="output",
         help="Output directory (default: output)",
     )
+    parser.add_argument(
+        "--workers", type=int, metavar="N", default=DEFAULT_WORKERS,
+        help=f"Pages fetched concurrently (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--cache", type=str, metavar="PATH", default=None,
+        help="Cache responses in an SQLite file (requires requests-cache)",
+    )
+    parser.add_argument(
+        "--stream", action="store_true", default=False,
+        help="Write books to the output file as pages arrive "
+             "(a failed CSV run leaves a partial file)",
+    )
 
     return parser
 
@@ -71,23 +91,45 @@ def print_summary(books: list[Book]) -> None:
     """Print summary statistics to stdout."""
     total = len(books)
     if total == 0:
-        print("\nSummary:")
-        print("  Total books: 0")
+        sys.stdout.write("\nSummary:\n  Total books: 0\n")
         return
 
-    avg_price = sum(book.price for book in books) / total
+    # One pass over the books: price sum plus a histogram indexed by
+    # rating. Only 1-5 stars are shown, so other ratings (0 = unrated)
+    # are left out rather than indexing outside the list.
+    price_sum = 0.0
+    rating_counts = [0] * 6
+    for book in books:
+        price_sum += book.price
+        if 1 <= book.rating <= 5:
+            rating_counts[book.rating] += 1
+    avg_price = price_sum / total
+
+    distribution = " | ".join(
+        f"{stars}\u2605 {rating_counts[stars]}" for stars in (5, 4, 3, 2, 1)
+    )
+
+    # Built up front and written in one call instead of one print() each.
+    sys.stdout.write(
+        "\nSummary:\n"
+        f"  Total books: {total}\n"
+        f"  Avg price: \u00a3{avg_price:.2f}\n"
+        f"  Rating distribution: {distribution}\n"
+    )
+
 
-    rating_counts = Counter(book.rating for book in books)
-    distribution_parts = []
-    for stars in (5, 4, 3, 2, 1):
-        count = rating_counts.get(stars, 0)
-        distribution_parts.append(f"{stars}\u2605 {count}")
-    distribution = " | ".join(distribution_parts)
+def _iter_books(parser: BooksParser, args: argparse.Namespace) -> Iterator[Book]:
+    """Return the book stream selected by the CLI mode."""
+    if args.category:
+        return parser.iter_category(args.category)
+    return parser.iter_catalog(max_pages=0 if args.all else args.pages)
 
-    print("\nSummary:")
-    print(f"  Total books: {total}")
-    print(f"  Avg price: \u00a3{avg_price:.2f}")
-    print(f"  Rating distribution: {distribution}")
+
+def _collect(books: Iterable[Book], into: list[Book]) -> Iterator[Book]:
+    """Pass *books* through, keeping each one in *into* for the summary."""
+    for book in books:
+        into.append(book)
+        yield book
 
 
 def main(argv: list[str] | None = None) -> None:
@@ -100,16 +142,33 @@ def main(argv: list[str] | None = None) -> None:
         logger.error("--pages must be >= 1, got %d", args.pages)
         sys.exit(1)
 
+    if args.workers < 1:
+        logger.error("--workers must be >= 1, got %d", args.workers)
+        sys.exit(1)
+
     export_fn = export_csv if args.format == "csv" else export_json
 
     logger.info("Starting scraper...")
     start_time = time.monotonic()
 
     try:
-        with BooksFetcher() as fetcher:
-            parser = BooksParser(fetcher)
-
-            if args.category:
+        with BooksFetcher(cache_path=args.cache) as fetcher:
+            parser = BooksParser(fetcher, max_workers=args.workers)
+
+            if args.stream:
+                # The exporter pulls pages through the scraper, so rows are
+                # written while later pages are still being fetched. The
+                # first book is taken up front so that an empty scrape
+                # writes no file.
+                books: list[Book] = []
+                stream = _iter_books(parser, args)
+                first = next(stream, None)
+                if first is not None:
+                    output_path = export_fn(
+                        _collect(chain([first], stream), books),
+                        args.output_dir,
+                    )
+            elif args.category:
                 books = parser.scrape_category(args.category)
             elif args.all:
                 books = parser.scrape_catalog(max_pages=0)
@@ -122,6 +181,12 @@ def main(argv: list[str] | None = None) -> None:
     except ParseError as exc:
         logger.error("Parse failed: %s", exc)
         sys.exit(1)
+    except ExportError as exc:  # --stream exports inside the scrape
+        logger.error("Export failed: %s", exc)
+        sys.exit(1)
+    except ImportError as exc:  # --cache without requests-cache installed
+        logger.error("Cannot use --cache: %s", exc)
+        sys.exit(1)
 
     elapsed = time.monotonic() - start_time
     logger.info("Done! %d books scraped in %.1fs", len(books), elapsed)
@@ -131,11 +196,12 @@ def main(argv: list[str] | None = None) -> None:
         print_summary(books)
         return
 
-    try:
-        output_path = export_fn(books, args.output_dir)
-    except ExportError as exc:
-        logger.error("Export failed: %s", exc)
-        sys.exit(1)
+    if not args.stream:
+        try:
+            output_path = export_fn(books, args.output_dir)
+        except ExportError as exc:
+            logger.error("Export failed: %s", exc)
+            sys.exit(1)
 
     logger.info("Saved to %s", output_path)
     print_summary(books)
@@ -1,6 +1,6 @@
 """HTML parser for books.toscrape.com catalog pages.
 
-Pure parsing functions accept HTML strings and return data.
+Pure parsing functions accept HTML (raw UTF-8 bytes or str) and return data.
 BooksParser orchestrator ties fetcher and parsing together.
 """
 
@@ -8,17 +8,22 @@ from __future__ import annotations
 
 import logging
 import re
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
+from html import unescape
+from itertools import chain
+from typing import Iterator, Optional
 from urllib.parse import urljoin
 
-from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
 
 from scraper.fetcher import BooksFetcher
 
 __all__ = [
     "Book", "BooksParser", "ParseError",
-    "parse_catalog_page", "parse_next_page_url",
+    "parse_catalog_page", "parse_next_page_url", "parse_page_count",
     "parse_categories", "parse_book_detail",
 ]
 
@@ -26,13 +31,80 @@ logger = logging.getLogger(__name__)
 
 BASE_URL = "https://books.toscrape.com/"
 CATALOG_URL = "https://books.toscrape.com/catalogue/page-{}.html"
+DEFAULT_WORKERS = 4
+# Below this many pages a process pool costs more to start than it saves.
+PARSE_POOL_MIN_PAGES = 4
 
 RATING_MAP = {
     "One": 1, "Two": 2, "Three": 3, "Four": 4, "Five": 5,
 }
 
-
-@dataclass
+_PRICE_RE = re.compile(r"\d*\.?\d+")
+_PAGE_COUNT_RE = re.compile(r"of\s+(\d+)")
+
+# Fast path for listing pages: books.toscrape.com renders every
+# product_pod with the same markup, so the fields can be read straight
+# from the text. Anything that does not match exactly goes to lxml.
+_ARTICLE_OPEN = '<article class="product_pod">'
+_ARTICLE_RE = re.compile(
+    r'<p class="(star-rating [^"]*)">.*?'
+    r'<h3><a href="([^"]*)"\s+title="([^"]+)">[^<]*</a></h3>\s*'
+    r'<div class="product_price">\s*'
+    r'<p class="price_color">([^<]*)</p>\s*'
+    r'<p class="(?:[^"]*\s)?availability(?:\s[^"]*)?">(.*?)</p>',
+    re.DOTALL,
+)
+_TAG_RE = re.compile(r"<[^>]*>")
+
+# books.toscrape.com serves UTF-8; without this lxml would assume Latin-1
+# for byte input that lacks a <meta charset>. Ignored for str input.
+_HTML_PARSER = lxml_html.HTMLParser(encoding="utf-8")
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate equivalent to the CSS class selector ``.name``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Element lookups, compiled once at import time. Each matches the same
+# nodes as the CSS selector it replaced (noted where not obvious).
+_XP_ARTICLE = etree.XPath(f".//article[{_has_class('product_pod')}]")
+_XP_TITLE_LINK = etree.XPath(".//h3//a")  # h3 a
+_XP_PRICE = etree.XPath(f".//*[{_has_class('price_color')}]")
+_XP_RATING = etree.XPath(f".//p[{_has_class('star-rating')}]")
+_XP_IN_STOCK = etree.XPath(  # p.instock.availability
+    f".//p[{_has_class('instock')} and {_has_class('availability')}]"
+)
+_XP_NEXT_LINK = etree.XPath(f".//li[{_has_class('next')}]//a")
+_XP_PAGER_CURRENT = etree.XPath(  # ul.pager li.current
+    f".//ul[{_has_class('pager')}]//li[{_has_class('current')}]"
+)
+_XP_CATEGORY_LINKS = etree.XPath(  # div.side_categories ul li ul li a
+    f".//div[{_has_class('side_categories')}]//ul//li//ul//li//a"
+)
+_XP_H1 = etree.XPath(".//h1")
+_XP_BREADCRUMBS = etree.XPath(f".//ul[{_has_class('breadcrumb')}]//li")
+
+
+def _field_xpath(path: str) -> etree.XPath:
+    """Compile ``string(path)``: a plain str, "" when the node is missing."""
+    return etree.XPath(f"string({path})", smart_strings=False)
+
+
+# Per-article fields of a listing page, evaluated to plain strings so that
+# no element proxy is created for them. The first set is anchored to the
+# child axes of books.toscrape.com's product_pod markup, which skips the
+# subtree walk; the descendant-axis set is the fallback for other markup.
+_XP_PRICE_TEXT = _field_xpath(f"./div/p[{_has_class('price_color')}]")
+_XP_RATING_CLASS = _field_xpath(f"./p[{_has_class('star-rating')}]/@class")
+_XP_AVAILABILITY_TEXT = _field_xpath(f"./div/p[{_has_class('availability')}]")
+
+_XP_PRICE_TEXT_ANY = _field_xpath(f".//*[{_has_class('price_color')}]")
+_XP_RATING_CLASS_ANY = _field_xpath(f".//p[{_has_class('star-rating')}]/@class")
+_XP_AVAILABILITY_TEXT_ANY = _field_xpath(f".//*[{_has_class('availability')}]")
+
+
+@dataclass(slots=True)
 class Book:
     """A single book's data."""
     title: str
@@ -54,20 +126,51 @@ class ParseError(Exception):
 
 # -- Private helpers -------------------------------------------------------
 
-def _parse_rating(element: BeautifulSoup) -> int:
+def _parse_document(html: str | bytes) -> lxml_html.HtmlElement:
+    """Parse *html* into an lxml tree. Empty input yields an empty <html>."""
+    try:
+        return lxml_html.document_fromstring(html, parser=_HTML_PARSER)
+    except etree.ParserError:
+        return lxml_html.Element("html")
+
+
+def _select_one(
+    xpath: etree.XPath,
+    element: lxml_html.HtmlElement,
+) -> Optional[lxml_html.HtmlElement]:
+    """Return the first element matched by *xpath*, or None."""
+    matches = xpath(element)
+    return matches[0] if matches else None
+
+
+def _text(element: lxml_html.HtmlElement) -> str:
+    """Return the element's text content with surrounding whitespace removed."""
+    return element.text_content().strip()
+
+
+def _rating_from_class(class_attr: str) -> int:
+    """Map a class attribute like ``"star-rating Three"`` to 1-5 (0 if none)."""
+    # books.toscrape.com always renders class="star-rating <Word>", so the
+    # rating word is the last token; scan every token only as a fallback.
+    rating = RATING_MAP.get(class_attr.rpartition(" ")[2])
+    if rating is not None:
+        return rating
+    return next(
+        (RATING_MAP[cls] for cls in class_attr.split() if cls in RATING_MAP), 0,
+    )
+
+
+def _parse_rating(element: lxml_html.HtmlElement) -> int:
     """Extract star rating (1-5) from an element containing p.star-rating."""
-    tag = element.select_one("p.star-rating")
+    tag = _select_one(_XP_RATING, element)
     if tag is None:
         return 0
-    for cls in tag.get("class", []):
-        if cls in RATING_MAP:
-            return RATING_MAP[cls]
-    return 0
+    return _rating_from_class(tag.get("class", ""))
 
 
 def _parse_price(text: str) -> float:
     """Extract numeric price from a string like '£51.77'."""
-    match = re.search(r"[\d.]+", text)
+    match = _PRICE_RE.search(text)
     if match is None:
         raise ValueError(f"Cannot parse price from: {text!r}")
     return float(match.group())
@@ -76,70 +179,141 @@ def _parse_price(text: str) -> float:
 # -- Pure parsing functions ------------------------------------------------
 
 def parse_catalog_page(
-    html: str,
+    html: str | bytes,
     base_url: str,
     category: str = "",
 ) -> list[Book]:
     """Parse a catalog/category listing page and return a list of Books."""
-    soup = BeautifulSoup(html, "lxml")
-    articles = soup.select("article.product_pod")
+    books = _parse_catalog_text(html, base_url, category)
+    if books is None:
+        books = _parse_catalog_tree(html, base_url, category)
 
-    books: list[Book] = []
-    for article in articles:
-        link = article.select_one("h3 a")
-        if link is None:
-            logger.warning("Skipping article without title link on %s", base_url)
-            continue
+    # The scrape loops already report each page at INFO; this per-call
+    # line would double the handler I/O on the fetch/parse threads.
+    logger.debug("Parsed %d books from %s", len(books), base_url)
+    return books
 
-        title = link.get("title", link.get_text(strip=True))
-        href = link.get("href", "")
-        book_url = urljoin(base_url, href)
 
-        price_tag = article.select_one(".price_color")
+def _make_book(
+    title: str,
+    href: str,
+    price_text: str,
+    rating_class: str,
+    availability: str,
+    base_url: str,
+    category: str,
+) -> Book:
+    """Build a Book from the raw field strings of one listing entry."""
+    try:
+        price = _parse_price(price_text) if price_text else 0.0
+    except ValueError:
+        logger.warning("Cannot parse price for '%s', defaulting to 0.0", title)
+        price = 0.0
+
+    return Book(
+        title=title,
+        price=price,
+        rating=_rating_from_class(rating_class),
+        availability="in stock" in availability.lower(),
+        category=category,
+        url=urljoin(base_url, href),
+    )
+
+
+def _parse_catalog_text(
+    html: str | bytes,
+    base_url: str,
+    category: str,
+) -> Optional[list[Book]]:
+    """Read listing entries with :data:`_ARTICLE_RE`, without building a tree.
+
+    Returns None as soon as any product_pod deviates from the site's
+    usual markup, so that the caller can parse the page with lxml.
+    """
+    if isinstance(html, bytes):
         try:
-            price = _parse_price(price_tag.get_text(strip=True)) if price_tag else 0.0
-        except ValueError:
-            logger.warning("Cannot parse price for '%s', defaulting to 0.0", title)
-            price = 0.0
-
-        rating = _parse_rating(article)
-
-        avail_tag = article.select_one(".availability")
-        in_stock = False
-        if avail_tag:
-            in_stock = "in stock" in avail_tag.get_text(strip=True).lower()
-
-        books.append(Book(
-            title=title,
-            price=price,
-            rating=rating,
-            availability=in_stock,
-            category=category,
-            url=book_url,
+            html = html.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+
+    chunks = html.split(_ARTICLE_OPEN)[1:]
+    if html.count("product_pod") != len(chunks):
+        return None  # product_pod with other attributes or classes
+
+    books: list[Book] = []
+    for chunk in chunks:
+        end = chunk.find("</article>")
+        match = _ARTICLE_RE.search(chunk, 0, end) if end >= 0 else None
+        if match is None:
+            return None
+        rating_class, href, title, price_text, availability = match.groups()
+        books.append(_make_book(
+            unescape(title),
+            unescape(href),
+            unescape(price_text).strip(),
+            rating_class,
+            unescape(_TAG_RE.sub("", availability)),
+            base_url,
+            category,
         ))
+    return books
+
 
-    logger.info("Parsed %d books from %s", len(books), base_url)
+def _parse_catalog_tree(
+    html: str | bytes,
+    base_url: str,
+    category: str,
+) -> list[Book]:
+    """Parse listing entries from the lxml tree; handles any markup."""
+    books: list[Book] = []
+    for article in _XP_ARTICLE(_parse_document(html)):
+        link = _select_one(_XP_TITLE_LINK, article)
+        if link is None:
+            logger.debug("Skipping article without title link on %s", base_url)
+            continue
+
+        books.append(_make_book(
+            link.get("title") or _text(link),
+            link.get("href", ""),
+            (_XP_PRICE_TEXT(article) or _XP_PRICE_TEXT_ANY(article)).strip(),
+            _XP_RATING_CLASS(article) or _XP_RATING_CLASS_ANY(article),
+            _XP_AVAILABILITY_TEXT(article) or _XP_AVAILABILITY_TEXT_ANY(article),
+            base_url,
+            category,
+        ))
     return books
 
 
-def parse_next_page_url(html: str, current_url: str) -> Optional[str]:
+def parse_next_page_url(html: str | bytes, current_url: str) -> Optional[str]:
     """Extract the URL of the next page. Returns None on the last page."""
-    soup = BeautifulSoup(html, "lxml")
-    next_link = soup.select_one("li.next a")
+    next_link = _select_one(_XP_NEXT_LINK, _parse_document(html))
     if next_link is None:
         return None
     href = next_link.get("href", "")
     return urljoin(current_url, href)
 
 
-def parse_categories(html: str, base_url: str) -> dict[str, str]:
+def parse_page_count(html: str | bytes) -> Optional[int]:
+    """Extract the total page count from the pager ("Page 1 of 50").
+
+    Returns None if the page has no pager (single-page listing).
+    """
+    current = _select_one(_XP_PAGER_CURRENT, _parse_document(html))
+    if current is None:
+        return None
+    match = _PAGE_COUNT_RE.search(_text(current))
+    if match is None:
+        return None
+    return int(match.group(1))
+
+
+def parse_categories(html: str | bytes, base_url: str) -> dict[str, str]:
     """Parse the sidebar and return {category_name: absolute_url}."""
-    soup = BeautifulSoup(html, "lxml")
-    links = soup.select("div.side_categories ul li ul li a")
+    links = _XP_CATEGORY_LINKS(_parse_document(html))
 
     categories: dict[str, str] = {}
     for link in links:
-        name = link.get_text(strip=True)
+        name = _text(link)
         href = link.get("href", "")
         categories[name] = urljoin(base_url, href)
 
@@ -147,37 +321,37 @@ def parse_categories(html: str, base_url: str) -> dict[str, str]:
     return categories
 
 
-def parse_book_detail(html: str, url: str) -> Book:
+def parse_book_detail(html: str | bytes, url: str) -> Book:
     """Parse a single book's detail page for complete data.
 
     Raises:
         ParseError: If <h1> (title) is not found.
     """
-    soup = BeautifulSoup(html, "lxml")
+    root = _parse_document(html)
 
-    h1 = soup.select_one("h1")
+    h1 = _select_one(_XP_H1, root)
     if h1 is None:
         raise ParseError(url, "No <h1> found on book detail page")
-    title = h1.get_text(strip=True)
+    title = _text(h1)
 
-    price_tag = soup.select_one(".price_color")
+    price_tag = _select_one(_XP_PRICE, root)
     try:
-        price = _parse_price(price_tag.get_text(strip=True)) if price_tag else 0.0
+        price = _parse_price(_text(price_tag)) if price_tag is not None else 0.0
     except ValueError:
         logger.warning("Cannot parse price for '%s', defaulting to 0.0", title)
         price = 0.0
 
-    rating = _parse_rating(soup)
+    rating = _parse_rating(root)
 
-    avail_tag = soup.select_one("p.instock.availability")
+    avail_tag = _select_one(_XP_IN_STOCK, root)
     in_stock = False
-    if avail_tag:
-        in_stock = "in stock" in avail_tag.get_text(strip=True).lower()
+    if avail_tag is not None:
+        in_stock = "in stock" in _text(avail_tag).lower()
 
-    breadcrumbs = soup.select("ul.breadcrumb li")
+    breadcrumbs = _XP_BREADCRUMBS(root)
     category = ""
     if len(breadcrumbs) >= 3:
-        category = breadcrumbs[2].get_text(strip=True)
+        category = _text(breadcrumbs[2])
 
     return Book(
         title=title,
@@ -189,19 +363,53 @@ def parse_book_detail(html: str, url: str) -> Book:
     )
 
 
+def _parse_listing_page(page: tuple[str, bytes], category: str) -> list[Book]:
+    """Parse one ``(url, html)`` listing page; picklable for process pools."""
+    url, html = page
+    return parse_catalog_page(html, url, category=category)
+
+
 # -- Orchestrator ----------------------------------------------------------
 
 class BooksParser:
     """High-level orchestrator: fetches pages via BooksFetcher
-    and parses them into Book objects."""
+    and parses them into Book objects.
+
+    Once the first page of a listing reveals the total page count, the
+    remaining pages are fetched concurrently by up to *max_workers*
+    threads sharing the same fetcher.
 
-    def __init__(self, fetcher: BooksFetcher) -> None:
+    Set *parse_processes* to parse large listings in a pool of that many
+    processes. It is off by default: lxml parses a catalog page in about
+    a millisecond, so the pool only pays off for very large listings on
+    multi-core machines.
+    """
+
+    def __init__(
+        self,
+        fetcher: BooksFetcher,
+        max_workers: int = DEFAULT_WORKERS,
+        parse_processes: int = 0,
+    ) -> None:
         self._fetcher = fetcher
+        self._max_workers = max_workers
+        self._parse_processes = parse_processes
+        self._categories: Optional[dict[str, str]] = None
+        # Lowercased name -> (display name, URL), for case-insensitive lookup.
+        self._category_index: dict[str, tuple[str, str]] = {}
 
     def get_categories(self) -> dict[str, str]:
-        """Fetch the homepage and return available categories."""
-        html = self._fetcher.fetch(BASE_URL)
-        return parse_categories(html, BASE_URL)
+        """Return available categories, fetching the homepage on first use.
+
+        The result is a copy, so callers cannot desync the cached mapping
+        from the lowercased index used by :meth:`scrape_category`.
+        """
+        if self._categories is None:
+            html = self._fetcher.fetch(BASE_URL)
+            self._categories = parse_categories(html, BASE_URL)
+            for name, url in self._categories.items():
+                self._category_index.setdefault(name.lower(), (name, url))
+        return dict(self._categories)
 
     def scrape_catalog(self, max_pages: int = 0) -> list[Book]:
         """Scrape the general catalog.
@@ -209,31 +417,17 @@ class BooksParser:
         Args:
             max_pages: Maximum pages to scrape. 0 means all.
         """
-        all_books: list[Book] = []
-        current_url: Optional[str] = CATALOG_URL.format(1)
-        page_num = 0
-
-        while current_url is not None:
-            page_num += 1
-            if max_pages > 0 and page_num > max_pages:
-                break
-
-            html = self._fetcher.fetch(current_url)
-            books = parse_catalog_page(html, current_url)
-            all_books.extend(books)
-
-            logger.info(
-                "Page %d - %d books found (total: %d)",
-                page_num, len(books), len(all_books),
-            )
+        return list(self.iter_catalog(max_pages))
 
-            current_url = parse_next_page_url(html, current_url)
+    def iter_catalog(self, max_pages: int = 0) -> Iterator[Book]:
+        """Yield catalog books page by page, as each page is parsed.
 
-        logger.info(
-            "Catalog scraping complete: %d books from %d pages",
-            len(all_books), page_num,
+        Same books, in the same order, as :meth:`scrape_catalog`; lets a
+        caller write them out while later pages are still being fetched.
+        """
+        return self._iter_listing(
+            "Catalog", CATALOG_URL.format(1), max_pages, category="",
         )
-        return all_books
 
     def scrape_category(
         self,
@@ -245,46 +439,147 @@ class BooksParser:
         Raises:
             ParseError: If the category is not found.
         """
-        categories = self.get_categories()
+        return list(self.iter_category(category_name, max_pages))
 
-        target_url: Optional[str] = None
-        matched_name: str = ""
-        for name, url in categories.items():
-            if name.lower() == category_name.lower():
-                target_url = url
-                matched_name = name
-                break
+    def iter_category(
+        self,
+        category_name: str,
+        max_pages: int = 0,
+    ) -> Iterator[Book]:
+        """Yield a category's books page by page, as each page is parsed.
+
+        The category is looked up before this returns, so an unknown name
+        fails here rather than on the first ``next()``.
+
+        Raises:
+            ParseError: If the category is not found.
+        """
+        categories = self.get_categories()
 
-        if target_url is None:
+        match = self._category_index.get(category_name.lower())
+        if match is None:
             available = ", ".join(sorted(categories.keys()))
             raise ParseError(
                 BASE_URL,
                 f"Category '{category_name}' not found. "
                 f"Available: {available}",
             )
+        matched_name, target_url = match
 
-        all_books: list[Book] = []
-        current_url: Optional[str] = target_url
-        page_num = 0
-
-        while current_url is not None:
-            page_num += 1
-            if max_pages > 0 and page_num > max_pages:
-                break
+        return self._iter_listing(
+            f"Category '{matched_name}'", target_url, max_pages,
+            category=matched_name,
+        )
 
-            html = self._fetcher.fetch(current_url)
-            books = parse_catalog_page(html, current_url, category=matched_name)
-            all_books.extend(books)
+    # -- Private -----------------------------------------------------------
 
+    def _iter_listing(
+        self,
+        label: str,
+        first_url: str,
+        max_pages: int,
+        category: str,
+    ) -> Iterator[Book]:
+        """Yield the books of a listing, dropping URLs already yielded.
+
+        A listing that shifts while it is being scraped (a book added or
+        removed on an earlier page) can show the same book on two pages.
+        """
+        seen: set[str] = set()
+        pages = total = 0
+
+        for books in self._scrape_pages(first_url, max_pages, category):
+            pages += 1
+            fresh: list[Book] = []
+            for book in books:
+                if book.url not in seen:
+                    seen.add(book.url)
+                    fresh.append(book)
+            total += len(fresh)
+
+            if len(fresh) < len(books):
+                logger.debug(
+                    "%s page %d - skipped %d books already seen",
+                    label, pages, len(books) - len(fresh),
+                )
             logger.info(
-                "Category '%s' page %d - %d books (total: %d)",
-                matched_name, page_num, len(books), len(all_books),
+                "%s page %d - %d books found (total: %d)",
+                label, pages, len(fresh), total,
             )
-
-            current_url = parse_next_page_url(html, current_url)
+            yield from fresh
 
         logger.info(
-            "Category '%s' complete: %d books from %d pages",
-            matched_name, len(all_books), page_num,
+            "%s scraping complete: %d books from %d pages",
+            label, total, pages,
         )
-        return all_books
+
+    def _scrape_pages(
+        self,
+        first_url: str,
+        max_pages: int,
+        category: str = "",
+    ) -> Iterator[list[Book]]:
+        """Fetch and parse a paginated listing, yielding books page by page.
+
+        Page 1 is fetched first. If its pager reports the total number of
+        pages, the remaining pages are fetched concurrently and each one
+        is parsed as soon as it (and every page before it) has arrived,
+        so parsing overlaps with the fetches still in flight. Without a
+        pager, "next" links are followed one page at a time.
+        """
+        html = self._fetcher.fetch(first_url)
+        total = parse_page_count(html)
+
+        if total is None:
+            url: Optional[str] = first_url
+            page_num = 0
+            while url is not None:
+                page_num += 1
+                yield parse_catalog_page(html, url, category=category)
+                if max_pages > 0 and page_num >= max_pages:
+                    break
+                url = parse_next_page_url(html, url)
+                if url is not None:
+                    html = self._fetcher.fetch(url)
+            return
+
+        if max_pages > 0:
+            total = min(total, max_pages)
+        urls = [urljoin(first_url, f"page-{n}.html") for n in range(2, total + 1)]
+        pages = chain([(first_url, html)], self._fetch_concurrently(urls))
+
+        if self._parse_processes <= 0 or total < PARSE_POOL_MIN_PAGES:
+            for page in pages:
+                yield _parse_listing_page(page, category)
+            return
+
+        # Each page is handed to the pool as soon as it arrives, so the
+        # processes parse while later pages are still being fetched.
+        # executor.map() would drain every fetch before returning a result.
+        backlog = 2 * self._parse_processes
+        with ProcessPoolExecutor(max_workers=self._parse_processes) as executor:
+            pending: deque[Future[list[Book]]] = deque()
+            for page in pages:
+                pending.append(
+                    executor.submit(_parse_listing_page, page, category)
+                )
+                while pending and (len(pending) > backlog or pending[0].done()):
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _fetch_concurrently(
+        self,
+        urls: list[str],
+    ) -> Iterator[tuple[str, bytes]]:
+        """Fetch *urls* in a thread pool, yielding ``(url, html)`` in order."""
+        if not urls:
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        try:
+            futures = [executor.submit(self._fetcher.fetch, url) for url in urls]
+            for url, future in zip(urls, futures):
+                yield url, future.result()
+        finally:
+            executor.shutdown(cancel_futures=True)
@@ -0,0 +1,42 @@
+"""Lightweight stand-ins for requests objects, shared by the tests."""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class FakeResponse:
+    """The parts of ``requests.Response`` that BooksFetcher reads."""
+
+    status_code: int = 200
+    content: bytes = b"<html></html>"
+    headers: dict = field(default_factory=dict)
+
+
+class FakeSession:
+    """A ``requests.Session`` double that replays canned responses.
+
+    Each ``get()`` returns the next entry of *responses*, or raises it if
+    the entry is an exception. Requested URLs are recorded in ``calls``.
+    """
+
+    def __init__(self, responses: list) -> None:
+        self._responses = list(responses)
+        self.calls: list[str] = []
+        self.headers: dict = {}
+        self.adapters: dict = {}
+        self.closed = False
+
+    def get(self, url: str, **kwargs) -> FakeResponse:
+        self.calls.append(url)
+        if not self._responses:
+            raise AssertionError(f"unexpected request for {url}")
+        response = self._responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    def mount(self, prefix: str, adapter) -> None:
+        self.adapters[prefix] = adapter
+
+    def close(self) -> None:
+        self.closed = True
@@ -123,6 +123,41 @@ class TestExportCsv(unittest.TestCase):
             path = export_csv(_sample_books(), tmp)  # str, not Path
             self.assertTrue(path.exists())
 
+    @patch("scraper.exporter.date")
+    def test_csv_accepts_iterator(self, mock_date):
+        mock_date.today.return_value = date(2026, 2, 6)
+        mock_date.side_effect = lambda *args, **kw: date(*args, **kw)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            for fast_csv in (False, True):
+                path = export_csv(
+                    iter(_sample_books()), Path(tmp), fast_csv=fast_csv,
+                )
+                with open(path, encoding="utf-8") as fh:
+                    rows = list(csv.DictReader(fh))
+                self.assertEqual(len(rows), 2)
+                self.assertEqual(rows[1]["title"], "Tipping the Velvet")
+
+    @patch("scraper.exporter.date")
+    def test_fast_csv_matches_csv_writer(self, mock_date):
+        mock_date.today.return_value = date(2026, 2, 6)
+        mock_date.side_effect = lambda *args, **kw: date(*args, **kw)
+        books = _sample_books() + [
+            Book(
+                title='Say "Hi", then\nleave',
+                price=0.1,
+                rating=5,
+                availability=True,
+                category="Sci-Fi, Fantasy",
+                url="https://books.toscrape.com/catalogue/hi_1/index.html",
+            ),
+        ]
+
+        with tempfile.TemporaryDirectory() as tmp:
+            expected = export_csv(books, Path(tmp) / "std").read_bytes()
+            actual = export_csv(books, Path(tmp) / "fast", fast_csv=True).read_bytes()
+            self.assertEqual(actual, expected)
+
 
 class TestExportJson(unittest.TestCase):
 
@@ -152,6 +187,18 @@ class TestExportJson(unittest.TestCase):
             self.assertEqual(data[0]["rating"], 3)
             self.assertIs(data[0]["availability"], True)
 
+    @patch("scraper.exporter.date")
+    def test_json_accepts_iterator(self, mock_date):
+        mock_date.today.return_value = date(2026, 2, 6)
+        mock_date.side_effect = lambda *args, **kw: date(*args, **kw)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = export_json(iter(_sample_books()), Path(tmp))
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+            self.assertEqual([d["title"] for d in data],
+                             ["A Light in the Attic", "Tipping the Velvet"])
+
     @patch("scraper.exporter.date")
     def test_json_empty_list(self, mock_date):
         mock_date.today.return_value = date(2026, 2, 6)
@@ -187,6 +234,19 @@ class TestExportJson(unittest.TestCase):
             raw = path.read_text(encoding="utf-8")
             self.assertTrue(raw.endswith("\n"))
 
+    @patch("scraper.exporter.date")
+    def test_json_stdlib_fallback_matches(self, mock_date):
+        mock_date.today.return_value = date(2026, 2, 6)
+        mock_date.side_effect = lambda *args, **kw: date(*args, **kw)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            raw = export_json(_sample_books(), Path(tmp) / "default").read_bytes()
+            with patch("scraper.exporter.orjson", None):
+                fallback = export_json(
+                    _sample_books(), Path(tmp) / "stdlib",
+                ).read_bytes()
+            self.assertEqual(raw, fallback)
+
     @patch("scraper.exporter.date")
     def test_json_returns_path(self, mock_date):
         mock_date.today.return_value = date(2026, 2, 6)
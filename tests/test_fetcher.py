@@ -1,86 +1,76 @@
 """Unit tests for scraper.fetcher module."""
 
+import threading
 import unittest
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import requests
 
 from scraper.fetcher import BooksFetcher, FetchError
+from tests._fakes import FakeResponse, FakeSession
 
 
 class TestBooksFetcher(unittest.TestCase):
     """Tests for BooksFetcher class."""
 
-    def _make_response(self, status_code=200, text="<html></html>"):
-        """Helper: create a mock requests.Response."""
-        resp = MagicMock()
-        resp.status_code = status_code
-        resp.text = text
-        return resp
-
-    @patch("scraper.fetcher.requests.Session")
-    def test_fetch_success(self, mock_session_cls):
-        """fetch() returns HTML string on 200 OK."""
-        mock_session = mock_session_cls.return_value
-        mock_session.get.return_value = self._make_response(200, "<p>ok</p>")
+    def test_fetch_success(self):
+        """fetch() returns the raw HTML bytes on 200 OK."""
+        session = FakeSession([FakeResponse(200, b"<p>ok</p>")])
 
-        with BooksFetcher(delay_between_requests=0) as f:
+        with BooksFetcher(delay_between_requests=0, session=session) as f:
             result = f.fetch("http://example.com")
 
-        self.assertEqual(result, "<p>ok</p>")
+        self.assertEqual(result, b"<p>ok</p>")
         self.assertEqual(f.request_count, 1)
 
-    @patch("scraper.fetcher.requests.Session")
-    def test_fetch_retry_on_500(self, mock_session_cls):
+    def test_fetch_retry_on_500(self):
         """fetch() retries on 500 and succeeds on next attempt."""
-        mock_session = mock_session_cls.return_value
-        mock_session.get.side_effect = [
-            self._make_response(500),
-            self._make_response(200, "<p>ok</p>"),
-        ]
+        session = FakeSession([
+            FakeResponse(500),
+            FakeResponse(200, b"<p>ok</p>"),
+        ])
 
         with BooksFetcher(
-            max_retries=2, backoff_factor=0.01, delay_between_requests=0
+            max_retries=2, backoff_factor=0.01, delay_between_requests=0,
+            session=session,
         ) as f:
             result = f.fetch("http://example.com")
 
-        self.assertEqual(result, "<p>ok</p>")
-        self.assertEqual(mock_session.get.call_count, 2)
+        self.assertEqual(result, b"<p>ok</p>")
+        self.assertEqual(len(session.calls), 2)
 
-    @patch("scraper.fetcher.requests.Session")
-    def test_fetch_raises_on_404(self, mock_session_cls):
+    def test_fetch_raises_on_404(self):
         """fetch() raises FetchError immediately on 404 (non-retryable)."""
-        mock_session = mock_session_cls.return_value
-        mock_session.get.return_value = self._make_response(404)
+        session = FakeSession([FakeResponse(404)])
 
-        with BooksFetcher(delay_between_requests=0) as f:
+        with BooksFetcher(delay_between_requests=0, session=session) as f:
             with self.assertRaises(FetchError) as ctx:
                 f.fetch("http://example.com/missing")
 
         self.assertIn("404", str(ctx.exception))
-        self.assertEqual(mock_session.get.call_count, 1)
+        self.assertEqual(len(session.calls), 1)
 
-    @patch("scraper.fetcher.requests.Session")
-    def test_fetch_all_retries_exhausted(self, mock_session_cls):
+    def test_fetch_all_retries_exhausted(self):
         """fetch() raises FetchError after all retries are exhausted."""
-        mock_session = mock_session_cls.return_value
-        mock_session.get.return_value = self._make_response(503)
+        session = FakeSession([FakeResponse(503)] * 3)
 
         with BooksFetcher(
-            max_retries=2, backoff_factor=0.01, delay_between_requests=0
+            max_retries=2, backoff_factor=0.01, delay_between_requests=0,
+            session=session,
         ) as f:
             with self.assertRaises(FetchError):
                 f.fetch("http://example.com")
 
         # 1 initial + 2 retries = 3 total
-        self.assertEqual(mock_session.get.call_count, 3)
+        self.assertEqual(len(session.calls), 3)
 
     @patch("scraper.fetcher.time.sleep")
-    @patch("scraper.fetcher.requests.Session")
-    def test_rate_limiting(self, mock_session_cls, mock_sleep):
+    def test_rate_limiting(self, mock_sleep):
         """Two consecutive fetch() calls trigger a rate-limit sleep."""
-        mock_session = mock_session_cls.return_value
-        mock_session.get.return_value = self._make_response(200)
+        session = FakeSession([FakeResponse()] * 2)
 
-        with BooksFetcher(delay_between_requests=2.0) as f:
+        with BooksFetcher(delay_between_requests=2.0, session=session) as f:
             f.fetch("http://example.com/page-1")
             f.fetch("http://example.com/page-2")
 
@@ -88,17 +78,102 @@ class TestBooksFetcher(unittest.TestCase):
         self.assertTrue(mock_sleep.called)
 
     @patch("scraper.fetcher.time.sleep")
-    @patch("scraper.fetcher.requests.Session")
-    def test_exponential_backoff_delays(self, mock_session_cls, mock_sleep):
-        """Backoff delays follow factor * 2^(attempt-1) pattern."""
-        mock_session = mock_session_cls.return_value
-        mock_session.get.return_value = self._make_response(500)
+    @patch("scraper.fetcher.time.monotonic")
+    def test_rate_limit_sleeps_only_the_deficit(self, mock_monotonic, mock_sleep):
+        """Time spent between fetches counts toward the delay."""
+        session = FakeSession([FakeResponse()] * 3)
+        clock = [100.0]
+        mock_monotonic.side_effect = lambda: clock[0]
+
+        with BooksFetcher(delay_between_requests=2.0, session=session) as f:
+            f.fetch("http://example.com/page-1")
+            clock[0] += 2.5  # caller was busy longer than the delay
+            f.fetch("http://example.com/page-2")
+            mock_sleep.assert_not_called()
+
+            clock[0] += 0.5
+            f.fetch("http://example.com/page-3")
+
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 1.5)
+
+    def test_retry_not_blocked_by_rate_limit_sleep(self):
+        """A retry only waits out its backoff, not another thread's token wait."""
+        a_sent = threading.Event()
+        rate_sleeping = threading.Event()
+        release_rate = threading.Event()
+        retry_done = threading.Event()
+
+        def sleep(seconds):
+            if seconds > 1:  # the rate-limit wait, not the 0.01s backoff
+                rate_sleeping.set()
+                release_rate.wait(timeout=5)
+
+        class Session(FakeSession):
+            def get(self, url, **kwargs):
+                if url.endswith("/a") and not self.calls:
+                    # Fail the first attempt once the other thread sleeps.
+                    a_sent.set()
+                    rate_sleeping.wait(timeout=5)
+                return super().get(url, **kwargs)
+
+        session = Session([FakeResponse(500), FakeResponse(), FakeResponse()])
+        fetcher = BooksFetcher(
+            max_retries=1, backoff_factor=0.01, jitter=False,
+            delay_between_requests=3.0, session=session,
+        )
+
+        def fetch_a():
+            fetcher.fetch("http://example.com/a")
+            retry_done.set()
+
+        with patch("scraper.fetcher.time.sleep", side_effect=sleep):
+            a = threading.Thread(target=fetch_a)
+            b = threading.Thread(
+                target=fetcher.fetch, args=("http://example.com/b",),
+            )
+            a.start()
+            a_sent.wait(timeout=5)  # a holds the only token
+            b.start()
+            try:
+                self.assertTrue(retry_done.wait(timeout=2))
+            finally:
+                release_rate.set()
+                a.join()
+                b.join()
+
+        self.assertEqual(fetcher.request_count, 3)
+
+    @patch("scraper.fetcher.time.sleep")
+    def test_burst_allows_back_to_back_requests(self, mock_sleep):
+        """Up to `burst` requests go out without sleeping, then the limiter kicks in."""
+        session = FakeSession([FakeResponse()] * 4)
 
         with BooksFetcher(
-            max_retries=3, backoff_factor=1.0, delay_between_requests=0
+            delay_between_requests=2.0, burst=3, session=session,
         ) as f:
-            with self.assertRaises(FetchError):
-                f.fetch("http://example.com")
+            for n in range(3):
+                f.fetch(f"http://example.com/page-{n}")
+            mock_sleep.assert_not_called()
+
+            f.fetch("http://example.com/page-3")
+
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 2.0, places=1)
+
+    @patch("scraper.fetcher.time.sleep")
+    def test_exponential_backoff_delays(self, mock_sleep):
+        """Backoff ceilings follow factor * 2^(attempt-1) pattern."""
+        session = FakeSession([FakeResponse(500)] * 4)
+
+        with BooksFetcher(
+            max_retries=3, backoff_factor=1.0, delay_between_requests=0,
+            session=session,
+        ) as f:
+            # Pin the jitter to the top of its range.
+            with patch.object(f._rng, "uniform", side_effect=lambda a, b: b):
+                with self.assertRaises(FetchError):
+                    f.fetch("http://example.com")
 
         # Expected backoff sleeps: 1.0, 2.0, 4.0
         sleep_values = [call[0][0] for call in mock_sleep.call_args_list]
@@ -106,69 +181,230 @@ class TestBooksFetcher(unittest.TestCase):
         self.assertIn(2.0, sleep_values)
         self.assertIn(4.0, sleep_values)
 
-    @patch("scraper.fetcher.requests.Session")
-    def test_fetch_retry_on_connection_error(self, mock_session_cls):
-        """fetch() retries on ConnectionError."""
-        import requests as real_requests
+    @patch("scraper.fetcher.time.sleep")
+    def test_backoff_without_jitter(self, mock_sleep):
+        """jitter=False sleeps exactly factor * 2^(attempt-1), still capped."""
+        session = FakeSession([FakeResponse(500)] * 5)
 
-        mock_session = mock_session_cls.return_value
-        mock_session.get.side_effect = [
-            real_requests.ConnectionError("Connection refused"),
-            self._make_response(200, "<p>recovered</p>"),
-        ]
+        with BooksFetcher(
+            max_retries=4, backoff_factor=1.0, backoff_cap=5.0,
+            jitter=False, delay_between_requests=0, session=session,
+        ) as f:
+            with self.assertRaises(FetchError):
+                f.fetch("http://example.com")
+
+        sleep_values = [call[0][0] for call in mock_sleep.call_args_list]
+        self.assertEqual(sleep_values, [1.0, 2.0, 4.0, 5.0])
+
+    @patch("scraper.fetcher.time.sleep")
+    def test_backoff_jitter_capped(self, mock_sleep):
+        """Jittered backoff stays within [0, min(cap, factor * 2^(attempt-1))]."""
+        session = FakeSession([FakeResponse(503)] * 4)
+
+        with BooksFetcher(
+            max_retries=3, backoff_factor=10.0, backoff_cap=15.0,
+            delay_between_requests=0, session=session,
+        ) as f:
+            with self.assertRaises(FetchError):
+                f.fetch("http://example.com")
+
+        sleep_values = [call[0][0] for call in mock_sleep.call_args_list]
+        self.assertEqual(len(sleep_values), 3)
+        for value, ceiling in zip(sleep_values, [10.0, 15.0, 15.0]):
+            self.assertGreaterEqual(value, 0.0)
+            self.assertLessEqual(value, ceiling)
+
+    @patch("scraper.fetcher.time.sleep")
+    def test_fetch_honors_retry_after(self, mock_sleep):
+        """A 429 with Retry-After sleeps the advised delay, capped at backoff_cap."""
+        session = FakeSession([
+            FakeResponse(429, headers={"Retry-After": "3"}),
+            FakeResponse(429, headers={"Retry-After": "120"}),
+            FakeResponse(200, b"<p>ok</p>"),
+        ])
 
         with BooksFetcher(
-            max_retries=2, backoff_factor=0.01, delay_between_requests=0
+            max_retries=3, backoff_cap=15.0, delay_between_requests=0,
+            session=session,
+        ) as f:
+            self.assertEqual(f.fetch("http://example.com"), b"<p>ok</p>")
+
+        sleep_values = [call[0][0] for call in mock_sleep.call_args_list]
+        self.assertEqual(sleep_values, [3.0, 15.0])
+
+    def test_parse_retry_after(self):
+        """Retry-After accepts delay-seconds or an HTTP-date."""
+        from datetime import datetime, timedelta, timezone
+        from email.utils import format_datetime
+        from scraper.fetcher import _parse_retry_after
+
+        self.assertEqual(_parse_retry_after("7"), 7.0)
+        self.assertEqual(_parse_retry_after("-5"), 0.0)
+        self.assertIsNone(_parse_retry_after("soon"))
+
+        later = datetime.now(timezone.utc) + timedelta(seconds=30)
+        self.assertAlmostEqual(
+            _parse_retry_after(format_datetime(later, usegmt=True)), 30, delta=2,
+        )
+        self.assertEqual(
+            _parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0.0,
+        )
+
+    def test_fetch_retry_on_connection_error(self):
+        """fetch() retries on ConnectionError."""
+        session = FakeSession([
+            requests.ConnectionError("Connection refused"),
+            FakeResponse(200, b"<p>recovered</p>"),
+        ])
+
+        with BooksFetcher(
+            max_retries=2, backoff_factor=0.01, delay_between_requests=0,
+            session=session,
         ) as f:
             result = f.fetch("http://example.com")
 
-        self.assertEqual(result, "<p>recovered</p>")
-        self.assertEqual(mock_session.get.call_count, 2)
+        self.assertEqual(result, b"<p>recovered</p>")
+        self.assertEqual(len(session.calls), 2)
 
-    @patch("scraper.fetcher.requests.Session")
-    def test_fetch_retry_on_timeout(self, mock_session_cls):
+    def test_fetch_retry_on_timeout(self):
         """fetch() retries on Timeout."""
-        import requests as real_requests
-
-        mock_session = mock_session_cls.return_value
-        mock_session.get.side_effect = [
-            real_requests.Timeout("Read timed out"),
-            self._make_response(200, "<p>ok</p>"),
-        ]
+        session = FakeSession([
+            requests.Timeout("Read timed out"),
+            FakeResponse(200, b"<p>ok</p>"),
+        ])
 
         with BooksFetcher(
-            max_retries=2, backoff_factor=0.01, delay_between_requests=0
+            max_retries=2, backoff_factor=0.01, delay_between_requests=0,
+            session=session,
         ) as f:
             result = f.fetch("http://example.com")
 
-        self.assertEqual(result, "<p>ok</p>")
+        self.assertEqual(result, b"<p>ok</p>")
 
-    @patch("scraper.fetcher.requests.Session")
-    def test_request_count_includes_retries(self, mock_session_cls):
+    def test_request_count_includes_retries(self):
         """request_count includes both initial attempts and retries."""
-        mock_session = mock_session_cls.return_value
-        mock_session.get.side_effect = [
-            self._make_response(500),
-            self._make_response(500),
-            self._make_response(200, "<p>ok</p>"),
-        ]
+        session = FakeSession([
+            FakeResponse(500),
+            FakeResponse(500),
+            FakeResponse(200, b"<p>ok</p>"),
+        ])
 
         with BooksFetcher(
-            max_retries=3, backoff_factor=0.01, delay_between_requests=0
+            max_retries=3, backoff_factor=0.01, delay_between_requests=0,
+            session=session,
         ) as f:
             f.fetch("http://example.com")
 
         self.assertEqual(f.request_count, 3)
 
+    def test_mounts_pooled_adapter(self):
+        """A keep-alive adapter with a POOL_SIZE pool is mounted for both schemes."""
+        from scraper.fetcher import POOL_SIZE
+
+        session = FakeSession([])
+        BooksFetcher(delay_between_requests=0, session=session)
+
+        self.assertEqual(set(session.adapters), {"http://", "https://"})
+        for adapter in session.adapters.values():
+            self.assertEqual(adapter._pool_maxsize, POOL_SIZE)
+            self.assertEqual(adapter.max_retries.total, 0)  # fetch() retries
+
     @patch("scraper.fetcher.requests.Session")
-    def test_context_manager_closes_session(self, mock_session_cls):
-        """Session is closed when exiting context manager."""
+    def test_session_reuses_connection(self, mock_session_cls):
+        """Every fetch() goes through the one Session, so connections are reused."""
+        from scraper.fetcher import DEFAULT_USER_AGENT, POOL_SIZE
+
         mock_session = mock_session_cls.return_value
+        mock_session.get.return_value = FakeResponse()
 
-        with BooksFetcher(delay_between_requests=0):
-            pass
+        with BooksFetcher(delay_between_requests=0) as f:
+            for n in range(10):
+                f.fetch(f"http://example.com/page-{n}.html")
 
+        self.assertEqual(mock_session_cls.call_count, 1)
+        self.assertEqual(mock_session.get.call_count, 10)
         mock_session.close.assert_called_once()
+        mock_session.headers.update.assert_called_once_with(
+            {"User-Agent": DEFAULT_USER_AGENT}
+        )
+        mounted = {call[0][0]: call[0][1] for call in mock_session.mount.call_args_list}
+        self.assertEqual(set(mounted), {"http://", "https://"})
+        for adapter in mounted.values():
+            self.assertEqual(adapter._pool_maxsize, POOL_SIZE)
+            self.assertEqual(adapter.max_retries.total, 0)
+
+    def test_injected_session_used_for_every_fetch(self):
+        """An injected session is configured, used for every fetch() and closed."""
+        from scraper.fetcher import DEFAULT_USER_AGENT
+
+        session = FakeSession([FakeResponse()] * 3)
+
+        with BooksFetcher(delay_between_requests=0, session=session) as f:
+            for n in range(3):
+                f.fetch(f"http://example.com/page-{n}.html")
+
+        self.assertEqual(len(session.calls), 3)
+        self.assertEqual(session.headers["User-Agent"], DEFAULT_USER_AGENT)
+        self.assertTrue(session.closed)
+
+    def test_session_and_cache_path_exclusive(self):
+        """An injected session cannot be combined with cache_path."""
+        with self.assertRaises(ValueError):
+            BooksFetcher(session=FakeSession([]), cache_path="cache.sqlite")
+
+    @patch("scraper.fetcher.requests_cache")
+    def test_cache_path_uses_cached_session(self, mock_cache_mod):
+        """cache_path switches the session to a SQLite-backed CachedSession."""
+        f = BooksFetcher(delay_between_requests=0, cache_path="cache.sqlite")
+
+        mock_cache_mod.CachedSession.assert_called_once()
+        args, kwargs = mock_cache_mod.CachedSession.call_args
+        self.assertEqual(args[0], "cache.sqlite")
+        self.assertEqual(kwargs["backend"], "sqlite")
+        self.assertIs(f._session, mock_cache_mod.CachedSession.return_value)
+
+    @patch("scraper.fetcher.time.sleep")
+    @patch("scraper.fetcher.requests_cache")
+    def test_cached_url_skips_rate_limit(self, mock_cache_mod, mock_sleep):
+        """Cache hits are not rate limited."""
+        mock_session = mock_cache_mod.CachedSession.return_value
+        mock_session.cache.get_response.return_value = SimpleNamespace(is_expired=False)
+        mock_session.get.return_value = FakeResponse()
+
+        with BooksFetcher(delay_between_requests=2.0, cache_path="c.sqlite") as f:
+            f.fetch("http://example.com/page-1")
+            f.fetch("http://example.com/page-2")
+
+        mock_sleep.assert_not_called()
+
+    @patch("scraper.fetcher.time.sleep")
+    @patch("scraper.fetcher.requests_cache")
+    def test_expired_cache_entry_is_rate_limited(self, mock_cache_mod, mock_sleep):
+        """Expired cache entries hit the network, so they are rate limited."""
+        mock_session = mock_cache_mod.CachedSession.return_value
+        mock_session.cache.get_response.return_value = SimpleNamespace(is_expired=True)
+        mock_session.get.return_value = FakeResponse()
+
+        with BooksFetcher(delay_between_requests=2.0, cache_path="c.sqlite") as f:
+            f.fetch("http://example.com/page-1")
+            f.fetch("http://example.com/page-2")
+
+        mock_sleep.assert_called_once()
+
+    @patch("scraper.fetcher.requests_cache", None)
+    def test_cache_path_requires_requests_cache(self):
+        """A clear ImportError is raised when requests-cache is missing."""
+        with self.assertRaises(ImportError):
+            BooksFetcher(cache_path="cache.sqlite")
+
+    def test_context_manager_closes_session(self):
+        """Session is closed when exiting context manager."""
+        session = FakeSession([])
+
+        with BooksFetcher(delay_between_requests=0, session=session):
+            pass
+
+        self.assertTrue(session.closed)
 
 
 if __name__ == "__main__":
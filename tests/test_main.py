@@ -53,6 +53,34 @@ class TestBuildParser(unittest.TestCase):
         args = build_parser().parse_args(["--all", "--output-dir", "results"])
         self.assertEqual(args.output_dir, "results")
 
+    def test_cache_default_none(self):
+        args = build_parser().parse_args(["--all"])
+        self.assertIsNone(args.cache)
+
+    def test_cache_path(self):
+        args = build_parser().parse_args(["--all", "--cache", "http_cache.sqlite"])
+        self.assertEqual(args.cache, "http_cache.sqlite")
+
+    def test_workers_default(self):
+        from scraper.parser import DEFAULT_WORKERS
+        args = build_parser().parse_args(["--all"])
+        self.assertEqual(args.workers, DEFAULT_WORKERS)
+
+    def test_workers_value(self):
+        args = build_parser().parse_args(["--all", "--workers", "8"])
+        self.assertEqual(args.workers, 8)
+
+    def test_stream_default_off(self):
+        args = build_parser().parse_args(["--all"])
+        self.assertFalse(args.stream)
+
+    def test_parser_built_once(self):
+        self.assertIs(build_parser(), build_parser())
+        first = build_parser().parse_args(["--pages", "2"])
+        second = build_parser().parse_args(["--all"])
+        self.assertEqual(first.pages, 2)
+        self.assertIsNone(second.pages)
+
     def test_mutually_exclusive_modes(self):
         with self.assertRaises(SystemExit):
             build_parser().parse_args(["--pages", "5", "--all"])
@@ -84,6 +112,17 @@ class TestPrintSummary(unittest.TestCase):
         self.assertIn("2\u2605 1", output)
         self.assertIn("1\u2605 1", output)
 
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_summary_exact_output(self, mock_stdout):
+        print_summary(_sample_books())
+        self.assertEqual(
+            mock_stdout.getvalue(),
+            "\nSummary:\n"
+            "  Total books: 5\n"
+            "  Avg price: \u00a330.00\n"
+            "  Rating distribution: 5\u2605 1 | 4\u2605 1 | 3\u2605 1 | 2\u2605 1 | 1\u2605 1\n",
+        )
+
     @patch("sys.stdout", new_callable=StringIO)
     def test_summary_empty_list(self, mock_stdout):
         print_summary([])
@@ -107,151 +146,172 @@ class TestPrintSummary(unittest.TestCase):
         self.assertIn("4\u2605 0", output)
         self.assertIn("3\u2605 0", output)
 
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_out_of_range_ratings_not_counted(self, mock_stdout):
+        books = [
+            Book("X", 10.0, 0, True, "Cat", "http://x.com/0"),
+            Book("Y", 20.0, 7, True, "Cat", "http://x.com/7"),
+            Book("Z", 30.0, 5, True, "Cat", "http://x.com/5"),
+        ]
+        print_summary(books)
+        output = mock_stdout.getvalue()
+        self.assertIn("Total books: 3", output)
+        self.assertIn("Avg price: \u00a320.00", output)
+        self.assertIn("5\u2605 1 | 4\u2605 0 | 3\u2605 0 | 2\u2605 0 | 1\u2605 0", output)
+
 
 class TestMain(unittest.TestCase):
 
     def setUp(self):
         logging.disable(logging.CRITICAL)
+        self.addCleanup(logging.disable, logging.NOTSET)
+
+        self.mock_fetcher_cls = self._patch("scraper.main.BooksFetcher")
+        self.mock_parser_cls = self._patch("scraper.main.BooksParser")
+        self.mock_export_csv = self._patch("scraper.main.export_csv")
+        self.mock_export_json = self._patch("scraper.main.export_json")
 
-    def tearDown(self):
-        logging.disable(logging.NOTSET)
+        self.mock_fetcher = MagicMock()
+        self.mock_fetcher_cls.return_value.__enter__.return_value = self.mock_fetcher
+        self.mock_fetcher_cls.return_value.__exit__.return_value = False
+        self.mock_parser = self.mock_parser_cls.return_value
+        self.mock_export_csv.return_value = Path("output/books.csv")
+        self.mock_export_json.return_value = Path("output/books.json")
 
-    @patch("scraper.main.export_csv")
-    @patch("scraper.main.BooksParser")
-    @patch("scraper.main.BooksFetcher")
-    def test_pages_mode_calls_scrape_catalog(
-        self, mock_fetcher_cls, mock_parser_cls, mock_export
-    ):
-        mock_fetcher = MagicMock()
-        mock_fetcher_cls.return_value.__enter__ = MagicMock(return_value=mock_fetcher)
-        mock_fetcher_cls.return_value.__exit__ = MagicMock(return_value=False)
+    def _patch(self, target):
+        """Start a patcher for the duration of the test and return its mock."""
+        patcher = patch(target)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
 
-        mock_parser = mock_parser_cls.return_value
-        mock_parser.scrape_catalog.return_value = _sample_books()
-        mock_export.return_value = Path("output/books.csv")
+    def test_pages_mode_calls_scrape_catalog(self):
+        self.mock_parser.scrape_catalog.return_value = _sample_books()
 
         main(["--pages", "3", "--format", "csv"])
-        mock_parser.scrape_catalog.assert_called_once_with(max_pages=3)
-        mock_export.assert_called_once()
-
-    @patch("scraper.main.export_json")
-    @patch("scraper.main.BooksParser")
-    @patch("scraper.main.BooksFetcher")
-    def test_all_mode_calls_scrape_catalog_zero(
-        self, mock_fetcher_cls, mock_parser_cls, mock_export
-    ):
-        mock_fetcher = MagicMock()
-        mock_fetcher_cls.return_value.__enter__ = MagicMock(return_value=mock_fetcher)
-        mock_fetcher_cls.return_value.__exit__ = MagicMock(return_value=False)
-
-        mock_parser = mock_parser_cls.return_value
-        mock_parser.scrape_catalog.return_value = _sample_books()
-        mock_export.return_value = Path("output/books.json")
+        self.mock_parser.scrape_catalog.assert_called_once_with(max_pages=3)
+        self.mock_export_csv.assert_called_once()
 
-        main(["--all", "--format", "json"])
-        mock_parser.scrape_catalog.assert_called_once_with(max_pages=0)
+    def test_all_mode_calls_scrape_catalog_zero(self):
+        self.mock_parser.scrape_catalog.return_value = _sample_books()
 
-    @patch("scraper.main.export_csv")
-    @patch("scraper.main.BooksParser")
-    @patch("scraper.main.BooksFetcher")
-    def test_category_mode(self, mock_fetcher_cls, mock_parser_cls, mock_export):
-        mock_fetcher = MagicMock()
-        mock_fetcher_cls.return_value.__enter__ = MagicMock(return_value=mock_fetcher)
-        mock_fetcher_cls.return_value.__exit__ = MagicMock(return_value=False)
+        main(["--all", "--format", "json"])
+        self.mock_parser.scrape_catalog.assert_called_once_with(max_pages=0)
+        self.mock_export_json.assert_called_once()
 
-        mock_parser = mock_parser_cls.return_value
-        mock_parser.scrape_category.return_value = _sample_books()
-        mock_export.return_value = Path("output/books.csv")
+    def test_category_mode(self):
+        self.mock_parser.scrape_category.return_value = _sample_books()
 
         main(["--category", "Science", "--format", "csv"])
-        mock_parser.scrape_category.assert_called_once_with("Science")
-
-    @patch("scraper.main.BooksParser")
-    @patch("scraper.main.BooksFetcher")
-    def test_fetch_error_exits_1(self, mock_fetcher_cls, mock_parser_cls):
-        mock_fetcher = MagicMock()
-        mock_fetcher_cls.return_value.__enter__ = MagicMock(return_value=mock_fetcher)
-        mock_fetcher_cls.return_value.__exit__ = MagicMock(return_value=False)
+        self.mock_parser.scrape_category.assert_called_once_with("Science")
 
+    def test_fetch_error_exits_1(self):
         from scraper.fetcher import FetchError
-        mock_parser = mock_parser_cls.return_value
-        mock_parser.scrape_catalog.side_effect = FetchError("http://x.com", "fail")
+        self.mock_parser.scrape_catalog.side_effect = FetchError("http://x.com", "fail")
 
         with self.assertRaises(SystemExit) as ctx:
             main(["--all"])
         self.assertEqual(ctx.exception.code, 1)
 
-    @patch("scraper.main.BooksParser")
-    @patch("scraper.main.BooksFetcher")
-    def test_parse_error_exits_1(self, mock_fetcher_cls, mock_parser_cls):
-        mock_fetcher = MagicMock()
-        mock_fetcher_cls.return_value.__enter__ = MagicMock(return_value=mock_fetcher)
-        mock_fetcher_cls.return_value.__exit__ = MagicMock(return_value=False)
-
+    def test_parse_error_exits_1(self):
         from scraper.parser import ParseError
-        mock_parser = mock_parser_cls.return_value
-        mock_parser.scrape_category.side_effect = ParseError("http://x.com", "not found")
+        self.mock_parser.scrape_category.side_effect = ParseError("http://x.com", "not found")
 
         with self.assertRaises(SystemExit) as ctx:
             main(["--category", "xyz"])
         self.assertEqual(ctx.exception.code, 1)
 
-    @patch("scraper.main.export_csv")
-    @patch("scraper.main.BooksParser")
-    @patch("scraper.main.BooksFetcher")
-    def test_export_error_exits_1(self, mock_fetcher_cls, mock_parser_cls, mock_export):
-        mock_fetcher = MagicMock()
-        mock_fetcher_cls.return_value.__enter__ = MagicMock(return_value=mock_fetcher)
-        mock_fetcher_cls.return_value.__exit__ = MagicMock(return_value=False)
-
-        mock_parser = mock_parser_cls.return_value
-        mock_parser.scrape_catalog.return_value = _sample_books()
+    def test_export_error_exits_1(self):
+        self.mock_parser.scrape_catalog.return_value = _sample_books()
 
         from scraper.exporter import ExportError
-        mock_export.side_effect = ExportError(Path("x.csv"), "Permission denied")
+        self.mock_export_csv.side_effect = ExportError(Path("x.csv"), "Permission denied")
 
         with self.assertRaises(SystemExit) as ctx:
             main(["--all"])
         self.assertEqual(ctx.exception.code, 1)
 
     @patch("scraper.main.print_summary")
-    @patch("scraper.main.export_csv")
-    @patch("scraper.main.BooksParser")
-    @patch("scraper.main.BooksFetcher")
-    def test_empty_result_skips_export(
-        self, mock_fetcher_cls, mock_parser_cls, mock_export, mock_summary
-    ):
-        mock_fetcher = MagicMock()
-        mock_fetcher_cls.return_value.__enter__ = MagicMock(return_value=mock_fetcher)
-        mock_fetcher_cls.return_value.__exit__ = MagicMock(return_value=False)
-
-        mock_parser = mock_parser_cls.return_value
-        mock_parser.scrape_catalog.return_value = []
+    def test_empty_result_skips_export(self, mock_summary):
+        self.mock_parser.scrape_catalog.return_value = []
 
         main(["--all"])
-        mock_export.assert_not_called()
+        self.mock_export_csv.assert_not_called()
         mock_summary.assert_called_once_with([])
 
-    @patch("scraper.main.BooksFetcher")
-    def test_pages_zero_exits_1(self, mock_fetcher_cls):
+    @patch("scraper.main.print_summary")
+    def test_stream_empty_result(self, mock_summary):
+        self.mock_parser.iter_catalog.return_value = iter([])
+
+        logging.disable(logging.NOTSET)  # setUp silences logging
+        with self.assertLogs("scraper.main", level="WARNING") as logs:
+            main(["--all", "--stream"])
+        self.mock_export_csv.assert_not_called()
+        mock_summary.assert_called_once_with([])
+        self.assertIn("No books found", logs.output[0])
+
+    def test_pages_zero_exits_1(self):
         with self.assertRaises(SystemExit) as ctx:
             main(["--pages", "0"])
         self.assertEqual(ctx.exception.code, 1)
 
-    @patch("scraper.main.export_csv")
-    @patch("scraper.main.BooksParser")
-    @patch("scraper.main.BooksFetcher")
-    def test_output_dir_passed(self, mock_fetcher_cls, mock_parser_cls, mock_export):
-        mock_fetcher = MagicMock()
-        mock_fetcher_cls.return_value.__enter__ = MagicMock(return_value=mock_fetcher)
-        mock_fetcher_cls.return_value.__exit__ = MagicMock(return_value=False)
+    def test_workers_zero_exits_1(self):
+        with self.assertRaises(SystemExit) as ctx:
+            main(["--all", "--workers", "0"])
+        self.assertEqual(ctx.exception.code, 1)
+        self.mock_fetcher_cls.assert_not_called()
+
+    def test_cache_without_requests_cache_exits_1(self):
+        self.mock_fetcher_cls.side_effect = ImportError(
+            "cache_path requires the optional 'requests-cache' package"
+        )
+
+        with self.assertRaises(SystemExit) as ctx:
+            main(["--pages", "1", "--cache", "x.sqlite"])
+        self.assertEqual(ctx.exception.code, 1)
+        self.mock_fetcher_cls.assert_called_once_with(cache_path="x.sqlite")
+
+    def test_workers_passed_to_parser(self):
+        self.mock_parser.scrape_catalog.return_value = _sample_books()
+
+        main(["--all", "--workers", "8"])
+        self.mock_parser_cls.assert_called_once_with(self.mock_fetcher, max_workers=8)
+
+    @patch("scraper.main.print_summary")
+    def test_stream_mode_exports_iterator(self, mock_summary):
+        self.mock_parser.iter_catalog.return_value = iter(_sample_books())
+        exported = []
+
+        def export(books, output_dir):
+            exported.extend(books)
+            return Path("output/books.csv")
+
+        self.mock_export_csv.side_effect = export
+
+        main(["--pages", "2", "--stream"])
+        self.mock_parser.iter_catalog.assert_called_once_with(max_pages=2)
+        self.mock_parser.scrape_catalog.assert_not_called()
+        self.assertEqual(exported, _sample_books())
+        mock_summary.assert_called_once_with(_sample_books())
+
+    def test_stream_fetch_error_exits_1(self):
+        from scraper.fetcher import FetchError
+
+        def books():
+            yield _sample_books()[0]
+            raise FetchError("http://x.com/page-2.html", "fail")
+
+        self.mock_parser.iter_category.return_value = books()
+        self.mock_export_csv.side_effect = lambda books, output_dir: list(books)
+
+        with self.assertRaises(SystemExit) as ctx:
+            main(["--category", "Science", "--stream"])
+        self.assertEqual(ctx.exception.code, 1)
 
-        mock_parser = mock_parser_cls.return_value
-        mock_parser.scrape_catalog.return_value = _sample_books()
-        mock_export.return_value = Path("custom_dir/books.csv")
+    def test_output_dir_passed(self):
+        self.mock_parser.scrape_catalog.return_value = _sample_books()
 
         main(["--all", "--output-dir", "custom_dir"])
-        args, kwargs = mock_export.call_args
+        args, kwargs = self.mock_export_csv.call_args
         self.assertEqual(args[1], "custom_dir")
 
 
@@ -1,7 +1,8 @@
 """Unit tests for scraper.parser module."""
 
+import threading
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from scraper.fetcher import BooksFetcher
 
@@ -75,6 +76,11 @@ LAST_PAGE_HTML = """
 </body></html>
 """
 
+PAGED_CATALOG_HTML = CATALOG_PAGE_HTML.replace(
+    '<ul class="pager">',
+    '<ul class="pager">\n    <li class="current">\n        Page 1 of 3\n    </li>',
+)
+
 OUT_OF_STOCK_HTML = """
 <html><body>
 <section>
@@ -133,27 +139,45 @@ class TestParsePrice(unittest.TestCase):
         with self.assertRaises(ValueError):
             _parse_price("free")
 
+    def test_parse_price_surrounding_dots(self):
+        from scraper.parser import _parse_price
+        self.assertAlmostEqual(_parse_price("Price: £51.77."), 51.77)
+        with self.assertRaises(ValueError):
+            _parse_price("£...")
+
+    def test_parse_price_leading_point(self):
+        from scraper.parser import _parse_price
+        self.assertAlmostEqual(_parse_price("£.99"), 0.99)
+        self.assertAlmostEqual(_parse_price("£10."), 10.0)
+
 
 class TestParseRating(unittest.TestCase):
     """Tests for _parse_rating helper."""
 
     def test_all_rating_values(self):
         from scraper.parser import _parse_rating
-        from bs4 import BeautifulSoup
+        from lxml import html as lxml_html
 
         for word, expected in [("One", 1), ("Two", 2), ("Three", 3),
                                ("Four", 4), ("Five", 5)]:
             html = f'<article><p class="star-rating {word}"></p></article>'
-            soup = BeautifulSoup(html, "lxml")
-            self.assertEqual(_parse_rating(soup), expected, f"Failed for {word}")
+            element = lxml_html.fromstring(html)
+            self.assertEqual(_parse_rating(element), expected, f"Failed for {word}")
+
+    def test_rating_word_first(self):
+        from scraper.parser import _parse_rating
+        from lxml import html as lxml_html
+
+        element = lxml_html.fromstring('<article><p class="Four star-rating"></p></article>')
+        self.assertEqual(_parse_rating(element), 4)
 
     def test_missing_rating(self):
         from scraper.parser import _parse_rating
-        from bs4 import BeautifulSoup
+        from lxml import html as lxml_html
 
         html = "<article></article>"
-        soup = BeautifulSoup(html, "lxml")
-        self.assertEqual(_parse_rating(soup), 0)
+        element = lxml_html.fromstring(html)
+        self.assertEqual(_parse_rating(element), 0)
 
 
 class TestParseCatalogPage(unittest.TestCase):
@@ -202,12 +226,60 @@ class TestParseCatalogPage(unittest.TestCase):
         books = parse_catalog_page("<html></html>", BASE_URL)
         self.assertEqual(books, [])
 
+    def test_empty_document(self):
+        from scraper.parser import parse_catalog_page
+        self.assertEqual(parse_catalog_page("", BASE_URL), [])
+
+    def test_utf8_bytes_input(self):
+        from scraper.parser import parse_catalog_page
+        html = CATALOG_PAGE_HTML.replace("Tipping the Velvet", "Tipping the Velvét")
+        books = parse_catalog_page(html.encode("utf-8"), BASE_URL)
+        self.assertAlmostEqual(books[0].price, 51.77)
+        self.assertEqual(books[1].title, "Tipping the Velvét")
+
     def test_out_of_stock(self):
         from scraper.parser import parse_catalog_page
         books = parse_catalog_page(OUT_OF_STOCK_HTML, BASE_URL)
         self.assertEqual(len(books), 1)
         self.assertFalse(books[0].availability)
 
+    def test_nonstandard_nesting(self):
+        from scraper.parser import parse_catalog_page
+        html = """
+        <article class="product_pod"><div>
+          <p class="star-rating Four"></p>
+          <h3><a href="x_1/index.html" title="Nested">Nested</a></h3>
+          <span class="price_color">£12.50</span>
+          <span class="instock availability">In stock</span>
+        </div></article>
+        """
+        books = parse_catalog_page(html, BASE_URL)
+        self.assertEqual(len(books), 1)
+        self.assertAlmostEqual(books[0].price, 12.50)
+        self.assertEqual(books[0].rating, 4)
+        self.assertTrue(books[0].availability)
+
+    def test_text_path_matches_tree(self):
+        from scraper.parser import _parse_catalog_text, _parse_catalog_tree
+        escaped = CATALOG_PAGE_HTML.replace(
+            'title="Tipping the Velvet"', 'title="Tipping &amp; the Velvet&#39;s"',
+        )
+        for html in (CATALOG_PAGE_HTML, LAST_PAGE_HTML, OUT_OF_STOCK_HTML,
+                     escaped, escaped.encode("utf-8")):
+            fast = _parse_catalog_text(html, BASE_URL, "Poetry")
+            self.assertIsNotNone(fast)
+            self.assertEqual(fast, _parse_catalog_tree(html, BASE_URL, "Poetry"))
+        self.assertEqual(fast[1].title, "Tipping & the Velvet's")
+
+    def test_text_path_defers_to_tree(self):
+        from scraper.parser import _parse_catalog_text
+        odd = CATALOG_PAGE_HTML.replace(
+            '<p class="price_color">£53.74</p>',
+            '<p class="price_color"><b>£53.74</b></p>',
+        )
+        self.assertIsNone(_parse_catalog_text(odd, BASE_URL, ""))
+        self.assertIsNone(_parse_catalog_text(b"\xff product_pod", BASE_URL, ""))
+
 
 class TestParseNextPageUrl(unittest.TestCase):
     """Tests for parse_next_page_url function."""
@@ -224,6 +296,18 @@ class TestParseNextPageUrl(unittest.TestCase):
         self.assertIsNone(url)
 
 
+class TestParsePageCount(unittest.TestCase):
+    """Tests for parse_page_count function."""
+
+    def test_page_count_from_pager(self):
+        from scraper.parser import parse_page_count
+        self.assertEqual(parse_page_count(PAGED_CATALOG_HTML), 3)
+
+    def test_no_pager(self):
+        from scraper.parser import parse_page_count
+        self.assertIsNone(parse_page_count(CATALOG_PAGE_HTML))
+
+
 class TestParseCategories(unittest.TestCase):
     """Tests for parse_categories function."""
 
@@ -285,6 +369,23 @@ class TestBooksParser(unittest.TestCase):
         self.assertEqual(mock_fetcher.fetch.call_count, 2)
         self.assertEqual(len(books), 3)  # 2 from page 1 + 1 from page 2
 
+    def test_scrape_catalog_deduplicates(self):
+        from scraper.parser import BooksParser
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.side_effect = [CATALOG_PAGE_HTML, CATALOG_PAGE_HTML]
+        parser = BooksParser(mock_fetcher)
+        with self.assertLogs("scraper.parser", level="INFO") as logs:
+            books = parser.scrape_catalog(max_pages=2)
+        self.assertEqual(mock_fetcher.fetch.call_count, 2)
+        self.assertEqual(
+            [book.title for book in books],
+            ["A Light in the Attic", "Tipping the Velvet"],
+        )
+        self.assertIn(
+            "INFO:scraper.parser:Catalog page 2 - 0 books found (total: 2)",
+            logs.output,
+        )
+
     def test_scrape_catalog_stops_at_last_page(self):
         from scraper.parser import BooksParser
         mock_fetcher = MagicMock(spec=BooksFetcher)
@@ -294,6 +395,142 @@ class TestBooksParser(unittest.TestCase):
         self.assertEqual(mock_fetcher.fetch.call_count, 1)
         self.assertEqual(len(books), 1)
 
+    def test_scrape_catalog_fetches_known_pages(self):
+        from scraper.parser import BooksParser
+        pages = {
+            "https://books.toscrape.com/catalogue/page-1.html": PAGED_CATALOG_HTML.encode(),
+            "https://books.toscrape.com/catalogue/page-2.html": LAST_PAGE_HTML.encode(),
+            "https://books.toscrape.com/catalogue/page-3.html": OUT_OF_STOCK_HTML.encode(),
+        }
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.side_effect = pages.__getitem__
+        parser = BooksParser(mock_fetcher)
+        books = parser.scrape_catalog(max_pages=0)
+        self.assertEqual(mock_fetcher.fetch.call_count, 3)
+        self.assertEqual(
+            [book.title for book in books],
+            ["A Light in the Attic", "Tipping the Velvet",
+             "Last Book", "Sold Out Book"],
+        )
+
+    def test_scrape_catalog_concurrent(self):
+        from scraper.parser import BooksParser, CATALOG_URL
+
+        def fetch(url):
+            if url == CATALOG_URL.format(1):
+                return PAGED_CATALOG_HTML
+            return LAST_PAGE_HTML if url == CATALOG_URL.format(2) else OUT_OF_STOCK_HTML
+
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.side_effect = fetch
+        parser = BooksParser(mock_fetcher, max_workers=2)
+        books = parser.scrape_catalog(max_pages=0)
+        self.assertEqual(mock_fetcher.fetch.call_count, 3)
+        self.assertEqual(len(books), 4)
+
+    def test_scrape_catalog_pager_respects_max_pages(self):
+        from scraper.parser import BooksParser
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.side_effect = [PAGED_CATALOG_HTML, LAST_PAGE_HTML]
+        parser = BooksParser(mock_fetcher)
+        books = parser.scrape_catalog(max_pages=2)
+        self.assertEqual(mock_fetcher.fetch.call_count, 2)
+        mock_fetcher.fetch.assert_called_with(
+            "https://books.toscrape.com/catalogue/page-2.html"
+        )
+        self.assertEqual(len(books), 3)
+
+    def test_scrape_catalog_parses_while_fetching(self):
+        from scraper import parser as parser_mod
+        page1_parsed = threading.Event()
+        overlapped = []
+        real_parse = parser_mod.parse_catalog_page
+
+        def fetch(url):
+            if url.endswith("page-1.html"):
+                return PAGED_CATALOG_HTML
+            if url.endswith("page-3.html"):
+                # Only returns promptly if page 1 is parsed meanwhile.
+                overlapped.append(page1_parsed.wait(timeout=2))
+                return OUT_OF_STOCK_HTML
+            return LAST_PAGE_HTML
+
+        def parse(html, url, category=""):
+            books = real_parse(html, url, category=category)
+            if url.endswith("page-1.html"):
+                page1_parsed.set()
+            return books
+
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.side_effect = fetch
+        with patch("scraper.parser.parse_catalog_page", side_effect=parse):
+            books = parser_mod.BooksParser(mock_fetcher).scrape_catalog()
+        self.assertEqual(overlapped, [True])
+        self.assertEqual(len(books), 4)
+
+    def test_scrape_catalog_parse_processes(self):
+        from scraper.parser import BooksParser
+        html = CATALOG_PAGE_HTML.replace(
+            '<ul class="pager">',
+            '<ul class="pager"><li class="current">Page 1 of 4</li>',
+        )
+        pages = {  # distinct book URLs per page, so nothing is deduplicated
+            f"https://books.toscrape.com/catalogue/page-{n}.html":
+                html.replace("/index.html", f"-p{n}/index.html")
+            for n in (1, 2, 3)
+        }
+        pages["https://books.toscrape.com/catalogue/page-4.html"] = LAST_PAGE_HTML
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.side_effect = pages.__getitem__
+        parser = BooksParser(mock_fetcher, parse_processes=2)
+        books = parser.scrape_catalog(max_pages=0)
+        self.assertEqual(len(books), 7)
+        self.assertEqual(books[-1].title, "Last Book")
+
+    def test_parse_processes_parse_while_fetching(self):
+        from concurrent.futures import ProcessPoolExecutor
+        from scraper.parser import BooksParser
+        page1_parsed = threading.Event()
+        overlapped = []
+
+        class RecordingPool(ProcessPoolExecutor):
+            def submit(self, fn, /, *args, **kwargs):
+                future = super().submit(fn, *args, **kwargs)
+                if args[0][0].endswith("page-1.html"):
+                    future.add_done_callback(lambda _: page1_parsed.set())
+                return future
+
+        html = CATALOG_PAGE_HTML.replace(
+            '<ul class="pager">',
+            '<ul class="pager"><li class="current">Page 1 of 4</li>',
+        )
+
+        def fetch(url):
+            if url.endswith("page-4.html"):
+                # Only returns promptly if page 1 is parsed meanwhile.
+                overlapped.append(page1_parsed.wait(timeout=10))
+                return LAST_PAGE_HTML
+            return html.replace("/index.html", f"-{url[-6]}/index.html")
+
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.side_effect = fetch
+        with patch("scraper.parser.ProcessPoolExecutor", RecordingPool):
+            books = BooksParser(mock_fetcher, parse_processes=2).scrape_catalog()
+        self.assertEqual(overlapped, [True])
+        self.assertEqual(len(books), 7)
+        self.assertEqual(books[-1].title, "Last Book")
+
+    def test_get_categories_cached(self):
+        from scraper.parser import BooksParser
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.return_value = CATALOG_PAGE_HTML
+        parser = BooksParser(mock_fetcher)
+        parser.get_categories().clear()  # caller mutation must not leak
+        cats = parser.get_categories()
+        self.assertEqual(mock_fetcher.fetch.call_count, 1)
+        self.assertIn("Science", cats)
+        self.assertEqual(len(cats), 2)
+
     def test_scrape_category_found(self):
         from scraper.parser import BooksParser
         mock_fetcher = MagicMock(spec=BooksFetcher)
@@ -326,6 +563,38 @@ class TestBooksParser(unittest.TestCase):
         books = parser.scrape_category("science")  # lowercase
         self.assertTrue(len(books) > 0)
 
+    def test_scrape_category_fetches_homepage_once(self):
+        from scraper.parser import BooksParser, BASE_URL as HOME_URL
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.side_effect = [
+            CATALOG_PAGE_HTML,  # homepage, first call only
+            LAST_PAGE_HTML,     # Science
+            LAST_PAGE_HTML,     # Travel
+        ]
+        parser = BooksParser(mock_fetcher)
+        parser.scrape_category("Science")
+        parser.scrape_category("travel")
+        fetched = [call[0][0] for call in mock_fetcher.fetch.call_args_list]
+        self.assertEqual(fetched.count(HOME_URL), 1)
+        self.assertEqual(len(fetched), 3)
+
+    def test_iter_catalog_yields_books(self):
+        from scraper.parser import BooksParser
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.side_effect = [CATALOG_PAGE_HTML, LAST_PAGE_HTML]
+        books = BooksParser(mock_fetcher).iter_catalog(max_pages=0)
+        mock_fetcher.fetch.assert_not_called()  # lazy until iterated
+        self.assertEqual(next(books).title, "A Light in the Attic")
+        self.assertEqual(mock_fetcher.fetch.call_count, 1)
+        self.assertEqual([b.title for b in books], ["Tipping the Velvet", "Last Book"])
+
+    def test_iter_category_unknown_raises_immediately(self):
+        from scraper.parser import BooksParser, ParseError
+        mock_fetcher = MagicMock(spec=BooksFetcher)
+        mock_fetcher.fetch.return_value = CATALOG_PAGE_HTML
+        with self.assertRaises(ParseError):
+            BooksParser(mock_fetcher).iter_category("Nonexistent")
+
     def test_get_categories(self):
         from scraper.parser import BooksParser
         mock_fetcher = MagicMock(spec=BooksFetcher)